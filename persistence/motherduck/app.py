@@ -1,41 +1,182 @@
 from shiny import App, ui, render, reactive
+import numpy as np
 import pandas as pd
 import re
 import duckdb
+import html
+import json
+import string
 import uuid
 import os
+import atexit
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 
+# Precompiled patterns, compiled once at import instead of per call
+_ENDANGERED = re.compile(r'endangered|critically')
+_VULNERABLE = re.compile(r'vulnerable|near threatened')
+
 # DuckDB and MotherDuck configuration
 MOTHERDUCK_TOKEN = os.getenv("MOTHERDUCK_TOKEN", "")
 DATABASE_NAME = "aquarium"
 LOCAL_DB_PATH = "local_ratings.duckdb"
 
-def get_duckdb_connection():
-    """Get DuckDB connection with MotherDuck fallback to local"""
+# Resolve the MotherDuck-vs-local decision once at import so the hot path
+# doesn't re-read the environment or branch on every call. A MotherDuck
+# connection failure surfaces once, via initialize_ratings_table.
+_DB_URI = (
+    f"md:{DATABASE_NAME}?motherduck_token={MOTHERDUCK_TOKEN}"
+    if MOTHERDUCK_TOKEN else LOCAL_DB_PATH
+)
+_DB_TYPE = "motherduck" if MOTHERDUCK_TOKEN else "local"
+
+# Shared sentinel connection, created lazily on first use. Opening a fresh
+# connection per operation pays TCP/auth (MotherDuck) or file-open overhead
+# on every rating save and summary refresh; instead we keep one connection
+# alive for the process and hand out cursors per call.
+_conn = None
+_conn_lock = threading.Lock()
+
+def _new_conn():
+    return duckdb.connect(_DB_URI)
+
+def get_conn():
+    """Get the shared DuckDB connection, creating it on first use"""
+    global _conn
+    if _conn is None:
+        with _conn_lock:
+            if _conn is None:
+                conn = _new_conn()
+                print(f"Connected to {_DB_TYPE} DuckDB")
+                _conn = conn
+    return _conn, _DB_TYPE
+
+# Ratings are queued here and flushed in batches by a background thread,
+# so a click costs an enqueue instead of a synchronous network round trip
+_write_queue = queue.Queue()
+_flusher = None
+_FLUSH_TIMEOUT = 0.25
+_FLUSH_BATCH_SIZE = 64
+
+# Queued at shutdown to tell the flusher to finish its batch and exit
+_STOP = object()
+
+# Bumped after every completed flush attempt. Sessions that just queued a
+# rating watch this before refreshing the summary, so they never re-query
+# (and cache) a summary taken while their rating was still in flight.
+_flush_version = 0
+
+# Batches that fail to reach DuckDB land here instead of being dropped
+_BACKUP_CSV = Path(__file__).parent / "ratings_backup.csv"
+
+def _backup_batch(batch):
+    """Append a batch that couldn't reach DuckDB to the backup CSV"""
     try:
-        if MOTHERDUCK_TOKEN:
-            # Try MotherDuck first
-            conn = duckdb.connect(f"md:{DATABASE_NAME}?motherduck_token={MOTHERDUCK_TOKEN}")
-            print("Connected to MotherDuck")
-            return conn, "motherduck"
-        else:
-            # Fall back to local DuckDB
-            conn = duckdb.connect(LOCAL_DB_PATH)
-            print("Connected to local DuckDB")
-            return conn, "local"
+        rows = pd.DataFrame({
+            'timestamp': [datetime.now().isoformat()] * len(batch),
+            'session_id': [r[0] for r in batch],
+            'animal_name': [r[1] for r in batch],
+            'rating': [r[2] for r in batch]
+        })
+        rows.to_csv(_BACKUP_CSV, mode='a', header=not _BACKUP_CSV.exists(), index=False)
+        print(f"Saved {len(batch)} rating(s) to backup CSV")
+    except Exception as e:
+        print(f"Error writing ratings backup: {e}")
+
+def _flush_batch(batch):
+    """Append a batch of queued ratings, bypassing the SQL parser"""
+    global _flush_version
+    try:
+        conn, db_type = get_conn()
+
+        # conn.append binds the frame straight to the table, so the batch
+        # skips SQL parsing and binding entirely. id/timestamp defaults
+        # aren't applied on this path, so fill them client-side.
+        rows = pd.DataFrame({
+            'id': [str(uuid.uuid4()) for _ in batch],
+            'timestamp': [datetime.now()] * len(batch),
+            'session_id': [r[0] for r in batch],
+            'animal_name': [r[1] for r in batch],
+            'rating': [r[2] for r in batch]
+        })
+
+        cur = conn.cursor()
+        cur.append('ratings', rows)
+        cur.close()
+        print(f"Flushed {len(batch)} rating(s) to {db_type}")
     except Exception as e:
-        print(f"Error connecting to MotherDuck, using local: {e}")
-        # Fall back to local DuckDB
-        conn = duckdb.connect(LOCAL_DB_PATH)
-        return conn, "local"
+        print(f"Error flushing ratings batch: {e}")
+        _backup_batch(batch)
+    finally:
+        # Count failed attempts too, so waiters stop waiting either way
+        _flush_version += 1
+
+def _drain_write_queue():
+    """Collect queued ratings, waiting briefly for the first one"""
+    batch = []
+    try:
+        batch.append(_write_queue.get(timeout=_FLUSH_TIMEOUT))
+        while len(batch) < _FLUSH_BATCH_SIZE:
+            batch.append(_write_queue.get_nowait())
+    except queue.Empty:
+        pass
+    return batch
+
+def _flush_ratings_forever():
+    """Background loop that batches queued ratings into DuckDB"""
+    while True:
+        batch = _drain_write_queue()
+        stopping = _STOP in batch
+        if stopping:
+            batch = [r for r in batch if r is not _STOP]
+        if batch:
+            _flush_batch(batch)
+        if stopping:
+            return
+
+def _shutdown():
+    """Stop the flusher, flush what's still queued, then close the connection.
+
+    One handler owns the whole sequence: joining the flusher first means
+    it's never mid-flush while the interpreter tears down, and the
+    connection stays open until the final flush has gone through.
+    """
+    global _conn
+    if _flusher is not None and _flusher.is_alive():
+        _write_queue.put(_STOP)
+        _flusher.join()
+    batch = []
+    try:
+        while True:
+            item = _write_queue.get_nowait()
+            if item is not _STOP:
+                batch.append(item)
+    except queue.Empty:
+        pass
+    if batch:
+        _flush_batch(batch)
+    if _conn is not None:
+        _conn.close()
+        _conn = None
 
 def initialize_ratings_table():
     """Initialize the ratings table"""
+    global _flusher
+
+    # Start the background flusher before touching the database, so queued
+    # ratings still reach the backup CSV when the connection is broken.
+    # Daemon only as a last resort: _shutdown joins it before teardown.
+    if _flusher is None:
+        _flusher = threading.Thread(target=_flush_ratings_forever, daemon=True)
+        _flusher.start()
+        atexit.register(_shutdown)
+
     try:
-        conn, db_type = get_duckdb_connection()
-        
+        conn, db_type = get_conn()
+
         # Create ratings table if it doesn't exist
         conn.execute("""
             CREATE TABLE IF NOT EXISTS ratings (
@@ -46,14 +187,23 @@ def initialize_ratings_table():
                 rating VARCHAR
             )
         """)
-        
-        # Create index for better performance
+
+        # Index on rating alone: the summary queries filter by rating
+        # first, so the old (animal_name, rating) index never helped them
+        conn.execute("DROP INDEX IF EXISTS idx_ratings_animal_rating")
         conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_ratings_animal_rating 
-            ON ratings(animal_name, rating)
+            CREATE INDEX IF NOT EXISTS idx_ratings_rating
+            ON ratings(rating)
         """)
-        
-        conn.close()
+
+        # Pre-aggregated view the summary queries read from
+        conn.execute("""
+            CREATE OR REPLACE VIEW ratings_top AS
+            SELECT rating, animal_name, COUNT(*) AS n
+            FROM ratings
+            GROUP BY rating, animal_name
+        """)
+
         print(f"Successfully initialized ratings table in {db_type}")
         return True
         
@@ -62,67 +212,55 @@ def initialize_ratings_table():
         return False
 
 def save_rating_to_duckdb(animal_name, rating, session_id):
-    """Save rating to DuckDB/MotherDuck"""
+    """Queue a rating for the background flusher"""
     try:
-        conn, db_type = get_duckdb_connection()
-        
-        print(f"Saving rating to {db_type}...")
-        
-        # Insert new rating
-        conn.execute("""
-            INSERT INTO ratings (session_id, animal_name, rating) 
-            VALUES (?, ?, ?)
-        """, [session_id, animal_name, rating])
-        
-        conn.close()
-        print(f"Successfully saved rating to {db_type}")
+        _write_queue.put((session_id, animal_name, rating))
         return True
-        
+
     except Exception as e:
-        print(f"Error saving to DuckDB: {e}")
+        print(f"Error queueing rating: {e}")
         return False
 
 def get_ratings_summary():
     """Get ratings summary from DuckDB/MotherDuck"""
     try:
-        conn, db_type = get_duckdb_connection()
-        
+        conn, db_type = get_conn()
+
         print(f"Reading ratings summary from {db_type}...")
-        
-        # Check if table exists and has data
+
+        # Use a cursor so concurrent Shiny sessions don't share cursor state
+        cur = conn.cursor()
+
+        # Get the top 10 per rating in a single round trip and split client-side
         try:
-            count_result = conn.execute("SELECT COUNT(*) as count FROM ratings").fetchone()
-            if count_result[0] == 0:
-                conn.close()
-                print("No ratings data found")
-                return None
+            summary = cur.execute("""
+                SELECT rating, animal_name, n
+                FROM ratings_top
+                WHERE rating IN ('Literally in love', 'Not my type')
+                QUALIFY row_number() OVER (PARTITION BY rating ORDER BY n DESC) <= 10
+            """).fetchdf()
         except:
-            conn.close()
+            cur.close()
             print("No ratings table found")
             return None
-        
-        # Get love summary
-        love_summary = conn.execute("""
-            SELECT animal_name, COUNT(*) as n 
-            FROM ratings 
-            WHERE rating = 'Literally in love' 
-            GROUP BY animal_name 
-            ORDER BY n DESC 
-            LIMIT 10
-        """).fetchdf()
-        
-        # Get nope summary
-        nope_summary = conn.execute("""
-            SELECT animal_name, COUNT(*) as n 
-            FROM ratings 
-            WHERE rating = 'Not my type' 
-            GROUP BY animal_name 
-            ORDER BY n DESC 
-            LIMIT 10
-        """).fetchdf()
-        
-        conn.close()
-        
+
+        cur.close()
+
+        if len(summary) == 0:
+            print("No ratings data found")
+            return None
+
+        love_summary = (
+            summary[summary['rating'] == 'Literally in love'][['animal_name', 'n']]
+            .sort_values('n', ascending=False)
+            .reset_index(drop=True)
+        )
+        nope_summary = (
+            summary[summary['rating'] == 'Not my type'][['animal_name', 'n']]
+            .sort_values('n', ascending=False)
+            .reset_index(drop=True)
+        )
+
         print(f"Love summary rows: {len(love_summary)}")
         print(f"Nope summary rows: {len(nope_summary)}")
         
@@ -132,15 +270,115 @@ def get_ratings_summary():
         print(f"Error reading from DuckDB: {e}")
         return None
 
-def sanitize_id(name):
-    """Convert animal name to valid Shiny input ID"""
-    # Replace any non-alphanumeric character with underscore
-    sanitized = re.sub(r'[^a-zA-Z0-9]', '_', name)
-    # Remove multiple consecutive underscores
-    sanitized = re.sub(r'_+', '_', sanitized)
-    # Remove leading/trailing underscores
-    sanitized = sanitized.strip('_')
-    return sanitized
+def _rating_onclick(name, rating, key):
+    """Build the onclick JS that reports a rating on the shared input channel"""
+    payload = json.dumps({"name": name, "rating": rating, "key": key})
+    return f"Shiny.setInputValue('rating_click', {payload}, {{priority: 'event'}})"
+
+# Broken featured images swap to a fallback SVG declared once in
+# styles.css, instead of embedding the ~300-byte data URI in every card's
+# onerror attribute. The 1x1 transparent GIF hides the broken-image glyph.
+_FALLBACK_ONERROR = (
+    "this.onerror=null;"
+    "this.classList.add('featured-image-fallback');"
+    "this.src='data:image/gif;base64,R0lGODlhAQABAIAAAAAAAP///yH5BAEAAAAALAAAAAABAAEAAAIBRAA7'"
+)
+
+def _esc(value):
+    """HTML-escape a value for the card templates"""
+    return html.escape(str(value), quote=True)
+
+# Animal cards are mostly static markup with a few substitutions, so
+# substituting into precompiled templates and emitting ui.HTML skips
+# building and serializing an htmltools tag tree for every card
+_CARD_TMPL = string.Template(
+    '<div class="animal-card">'
+    '$image'
+    '<div class="animal-name" onclick="window.open(\'$url\', \'_blank\')">'
+    '$name<span class="external-link-icon">↗</span>'
+    '</div>'
+    '<div class="scientific-name">$scientific_name</div>'
+    '$details'
+    '$fun_fact'
+    '$rating'
+    '</div>'
+)
+
+_CARD_IMAGE_TMPL = string.Template(
+    '<img src="$src" class="animal-image" onerror="this.style.display=\'none\'">'
+)
+
+_DETAIL_TMPL = string.Template(
+    '<p><span class="detail-label">$label</span>$value</p>'
+)
+
+_CONSERVATION_TMPL = string.Template(
+    '<p><span class="detail-label">Conservation Status: </span>'
+    '<span class="$cls">$value</span></p>'
+)
+
+_FUN_FACT_TMPL = string.Template(
+    '<div class="fun-fact"><strong>Fun Fact: </strong>$fact</div>'
+)
+
+_RATING_BUTTONS_TMPL = string.Template(
+    '<div class="rating-buttons">'
+    '<button class="love-button" onclick="$love_js">💕 Literally in love</button>'
+    '<button class="nope-button" onclick="$nope_js">👎 Not my type</button>'
+    '</div>'
+)
+
+_THANK_YOU_HTML = {
+    "love": '<div class="thank-you-message love-message">💕 Literally in love - Thanks for sharing!</div>',
+    "nope": '<div class="thank-you-message nope-message">👎 Not my type - Thanks for sharing!</div>',
+}
+
+# Columns the card templates need, in render order
+_CARD_COLS = [
+    'name', 'scientific_name', 'size', 'diet', 'habitat', 'range',
+    'conservation_status', 'fun_fact', 'image_url', 'url', '_cons_class'
+]
+
+def debounce(delay_secs):
+    """Debounce a reactive calc: only emit once the source value has settled"""
+    def wrapper(f):
+        when = reactive.value(None)
+        trigger = reactive.value(0)
+
+        @reactive.calc
+        def cached():
+            return f()
+
+        @reactive.effect(priority=102)
+        def primer():
+            try:
+                cached()
+            except Exception:
+                pass
+            finally:
+                when.set(time.monotonic() + delay_secs)
+
+        @reactive.effect(priority=101)
+        def timer():
+            deadline = when()
+            if deadline is None:
+                return
+            now = time.monotonic()
+            if now >= deadline:
+                when.set(None)
+                with reactive.isolate():
+                    trigger.set(trigger() + 1)
+            else:
+                reactive.invalidate_later(deadline - now)
+
+        @reactive.calc
+        @reactive.event(trigger, ignore_none=False)
+        def debounced():
+            with reactive.isolate():
+                return cached()
+
+        return debounced
+    return wrapper
 
 # Initialize the database table on startup
 if not initialize_ratings_table():
@@ -150,9 +388,38 @@ if not initialize_ratings_table():
 app_dir = Path(__file__).parent
 aquarium_csv_path = app_dir / "aquarium.csv"
 
+# Every column is text: passing explicit dtypes skips pandas' type
+# inference, and the pyarrow engine backs strings with contiguous Arrow
+# buffers (faster .str.contains than object arrays). The parsed frame is
+# cached as Parquet so later startups skip CSV parsing entirely.
+_csv_dtypes = {c: 'string' for c in [
+    'name', 'scientific_name', 'diet', 'habitat', 'range',
+    'physical_characteristics', 'fun_fact', 'conservation_status',
+    'image_url', 'url', 'size'
+]}
+aquarium_pq_path = aquarium_csv_path.with_suffix('.parquet')
+
+# The cache is only trusted while it's at least as new as the CSV, so an
+# edited aquarium.csv regenerates it on the next startup
+_pq_fresh = (
+    aquarium_pq_path.exists()
+    and (not aquarium_csv_path.exists()
+         or aquarium_pq_path.stat().st_mtime >= aquarium_csv_path.stat().st_mtime)
+)
+
 try:
-    aquarium_data = pd.read_csv(aquarium_csv_path)
-    print(f"Successfully loaded aquarium data from {aquarium_csv_path}")
+    if _pq_fresh:
+        aquarium_data = pd.read_parquet(aquarium_pq_path)
+        print(f"Successfully loaded aquarium data from {aquarium_pq_path}")
+    else:
+        try:
+            aquarium_data = pd.read_csv(aquarium_csv_path, dtype=_csv_dtypes, engine='pyarrow')
+            aquarium_data.to_parquet(aquarium_pq_path)
+        except (ImportError, ValueError) as e:
+            # pyarrow isn't available; fall back to the default C engine
+            print(f"Loading CSV with default engine: {e}")
+            aquarium_data = pd.read_csv(aquarium_csv_path, dtype=_csv_dtypes)
+        print(f"Successfully loaded aquarium data from {aquarium_csv_path}")
 except FileNotFoundError:
     print(f"Could not find aquarium.csv at {aquarium_csv_path}")
     # Create a minimal fallback dataset
@@ -170,6 +437,119 @@ except FileNotFoundError:
     })
     print("Using fallback sample data")
 
+# Guarantee every column the render paths read exists and uses '' for
+# missing values, so per-card checks are plain truthiness tests instead
+# of pd.notna calls and .get lookups with defaults
+expected_cols = [
+    'name', 'scientific_name', 'diet', 'habitat', 'range',
+    'physical_characteristics', 'fun_fact', 'conservation_status',
+    'image_url', 'url', 'size'
+]
+for col in expected_cols:
+    if col not in aquarium_data:
+        aquarium_data[col] = ''
+aquarium_data[expected_cols] = aquarium_data[expected_cols].fillna('')
+
+# Strip the displayed fields once here so whitespace-only values are ''
+# and the per-card checks stay bare truthiness tests
+for col in ['size', 'diet', 'habitat', 'range', 'conservation_status',
+            'fun_fact', 'image_url']:
+    aquarium_data[col] = aquarium_data[col].astype(str).str.strip()
+
+# Precompute a single lowercased haystack column joining all searchable
+# fields, so each search is one vectorized substring scan instead of
+# eight per-column lower+contains passes
+search_cols = [
+    'name', 'scientific_name', 'diet', 'habitat', 'range',
+    'physical_characteristics', 'fun_fact', 'conservation_status'
+]
+aquarium_data['_search_blob'] = (
+    aquarium_data[search_cols].fillna('').astype(str).agg(' '.join, axis=1).str.lower()
+)
+
+# Precompute the conservation class once at load time instead of per
+# card on every render
+_status = aquarium_data['conservation_status'].fillna('').astype(str).str.lower()
+aquarium_data['_cons_class'] = np.where(
+    _status.str.contains(_ENDANGERED),
+    'conservation-endangered',
+    np.where(
+        _status.str.contains(_VULNERABLE),
+        'conservation-vulnerable',
+        'conservation-stable'
+    )
+)
+
+# Copy the catalog into an in-process DuckDB database and run searches
+# there: a vectorized scan inside the engine instead of a pandas scan in
+# Python, which also scales to much larger catalogs
+# The table carries the catalog position as rownum so results can be
+# ordered back into catalog order: DuckDB's parallel scans don't
+# guarantee row order on their own
+_search_df = aquarium_data.copy()
+_search_df.insert(0, 'rownum', np.arange(len(_search_df)))
+_search_db = duckdb.connect()
+_search_db.register('aquarium_df', _search_df)
+_search_db.execute("CREATE OR REPLACE TABLE aquarium AS SELECT * FROM aquarium_df")
+_search_db.unregister('aquarium_df')
+del _search_df
+
+# Optional Numba-compiled scan for very large catalogs: the JIT kernel
+# streams one contiguous byte buffer over all cores with the GIL
+# released. numba isn't a declared dependency, so when it's absent the
+# DuckDB pushdown below handles the scan on its own.
+try:
+    from numba import njit, prange
+
+    _blob_buf = np.frombuffer(
+        '\x00'.join(aquarium_data['_search_blob']).encode('utf-8'), dtype=np.uint8
+    )
+    _blob_lengths = aquarium_data['_search_blob'].str.encode('utf-8').str.len().to_numpy(np.int64)
+    _blob_offsets = np.zeros(len(_blob_lengths) + 1, dtype=np.int64)
+    np.cumsum(_blob_lengths + 1, out=_blob_offsets[1:])
+
+    @njit(parallel=True, cache=True)
+    def _scan_blobs(buf, offsets, needle):
+        n = len(offsets) - 1
+        m = len(needle)
+        out = np.zeros(n, dtype=np.bool_)
+        for i in prange(n):
+            start = offsets[i]
+            end = offsets[i + 1] - 1  # records are NUL-separated
+            for j in range(start, end - m + 1):
+                k = 0
+                while k < m and buf[j + k] == needle[k]:
+                    k += 1
+                if k == m:
+                    out[i] = True
+                    break
+        return out
+
+    # Warm the JIT so the first real search doesn't pay compile time
+    _scan_blobs(_blob_buf, _blob_offsets, np.frombuffer(b'zz', dtype=np.uint8))
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+def search_aquarium(query_lower):
+    """Filter the catalog with the Numba kernel or the DuckDB pushdown"""
+    if _HAVE_NUMBA:
+        needle = np.frombuffer(query_lower.encode('utf-8'), dtype=np.uint8)
+        return aquarium_data[_scan_blobs(_blob_buf, _blob_offsets, needle)]
+
+    # Escape LIKE wildcards so the query stays a literal substring match
+    escaped = (
+        query_lower.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    )
+    cur = _search_db.cursor()
+    result = cur.execute(
+        "SELECT * EXCLUDE (rownum) FROM aquarium "
+        "WHERE _search_blob LIKE ? ESCAPE '\\' ORDER BY rownum",
+        ['%' + escaped + '%']
+    ).fetchdf()
+    cur.close()
+    return result
+
 # Select 8 diverse and appealing animals for the landing page
 featured_animal_names = [
     "Sea Otter", "Beluga Whale", "Penguin", "Seahorse",
@@ -182,6 +562,37 @@ featured_animals_df = aquarium_data[aquarium_data['name'].isin(featured_animal_n
 if len(featured_animals_df) < 8:
     featured_animals_df = aquarium_data.head(8)
 
+def _build_featured_ui():
+    """Build the featured-animal cards once; their content never changes"""
+    featured_cards = []
+
+    for animal in featured_animals_df[['name', 'image_url']].itertuples(index=False):
+        # Handle image
+        if animal.image_url:
+            image_element = ui.img(
+                src=animal.image_url,
+                class_="featured-image",
+                onerror=_FALLBACK_ONERROR
+            )
+        else:
+            image_element = ui.div(
+                "🐠",
+                class_="featured-image",
+                style="background: linear-gradient(135deg, #447099 0%, #419599 100%); display: flex; align-items: center; justify-content: center; color: white; font-size: 24px;"
+            )
+
+        card = ui.div(
+            image_element,
+            ui.div(animal.name, class_="featured-name"),
+            class_="featured-card",
+            onclick=f"Shiny.setInputValue('featured_animal_click', '{animal.name}', {{priority: 'event'}});"
+        )
+        featured_cards.append(card)
+
+    return ui.div(*featured_cards, class_="favorites-grid")
+
+_FEATURED_UI = _build_featured_ui()
+
 # Define UI
 app_ui = ui.page_fluid(
     ui.head_content(
@@ -254,83 +665,86 @@ def server(input, output, session):
     
     # Reactive trigger for ratings updates
     ratings_trigger = reactive.value(0)
-    
-    # Store button observers to prevent garbage collection
-    button_observers = {}
-    
+
+    # _flush_version observed when this session queued its latest rating,
+    # or None when no flush is pending
+    awaiting_flush = reactive.value(None)
+
     def clean_text(text):
         """Clean up text fields helper function"""
         if pd.isna(text) or text == "":
             return ""
         # Remove extra quotes and clean up formatting
-        text = re.sub(r'^"|"$', '', str(text))
-        text = re.sub(r'""', '"', text)
-        return text
+        text = str(text)
+        if text.startswith('"'):
+            text = text[1:]
+        if text.endswith('"'):
+            text = text[:-1]
+        return text.replace('""', '"')
     
     def save_rating(animal_name, rating, session_id):
-        """Save rating with fallback to CSV"""
+        """Queue a rating; the flusher falls back to the backup CSV"""
         print(f"Attempting to save rating: {animal_name} - {rating}")
-        
-        # Save to DuckDB/MotherDuck
-        duckdb_success = save_rating_to_duckdb(animal_name, rating, session_id)
-        
-        if duckdb_success:
-            print("Successfully saved rating to DuckDB")
-        else:
-            # Fall back to local CSV
-            rating_data = pd.DataFrame({
-                'timestamp': [datetime.now().isoformat()],
-                'session_id': [session_id],
-                'animal_name': [animal_name],
-                'rating': [rating]
-            })
-            
-            backup_file = app_dir / "ratings_backup.csv"
-            if not backup_file.exists():
-                rating_data.to_csv(backup_file, index=False)
-            else:
-                rating_data.to_csv(backup_file, mode='a', header=False, index=False)
-            print("Saved to backup CSV")
-    
-    def create_rating_observer(animal_name, button_id, rating_type, rating_key):
-        """Create an observer for a specific rating button"""
-        def rating_handler():
-            try:
-                button_value = getattr(input, button_id)()
-                if button_value and button_value > 0:
-                    current_ratings = rated_animals.get()
-                    if animal_name not in current_ratings:
-                        save_rating(animal_name, rating_type, session_id)
-                        
-                        # Update rated animals
-                        new_ratings = current_ratings.copy()
-                        new_ratings[animal_name] = rating_key
-                        rated_animals.set(new_ratings)
-                        
-                        # Trigger ratings summary refresh
-                        ratings_trigger.set(ratings_trigger.get() + 1)
-                        
-                        # Show feedback notification
-                        if rating_key == "love":
-                            ui.notification_show(
-                                f"💕 Recorded your love for {animal_name}!",
-                                type="message",
-                                duration=2
-                            )
-                        else:
-                            ui.notification_show(
-                                f"👎 Noted that {animal_name} is not your type",
-                                type="message", 
-                                duration=2
-                            )
-            except AttributeError:
-                # Button doesn't exist yet, ignore
-                pass
-            except Exception as e:
-                print(f"Error in rating handler: {e}")
-        
-        return reactive.effect(rating_handler)
+        save_rating_to_duckdb(animal_name, rating, session_id)
     
+    # One delegated observer handles every rating button, instead of two
+    # reactive effects per rendered card accumulating over the session
+    @reactive.effect
+    @reactive.event(input.rating_click)
+    def _():
+        event = input.rating_click()
+        if not event:
+            return
+
+        animal_name = event["name"]
+        rating_key = event["key"]
+
+        current_ratings = rated_animals.get()
+        if animal_name in current_ratings:
+            return
+
+        save_rating(animal_name, event["rating"], session_id)
+
+        # Update rated animals
+        new_ratings = current_ratings.copy()
+        new_ratings[animal_name] = rating_key
+        rated_animals.set(new_ratings)
+
+        # The rating is still sitting in the write queue; refreshing the
+        # summary now would re-query (and cache) a result that misses it.
+        # Arm the flush watcher instead, which bumps the trigger once the
+        # background flusher has committed the batch.
+        awaiting_flush.set(_flush_version)
+
+        # Show feedback notification
+        if rating_key == "love":
+            ui.notification_show(
+                f"💕 Recorded your love for {animal_name}!",
+                type="message",
+                duration=2
+            )
+        else:
+            ui.notification_show(
+                f"👎 Noted that {animal_name} is not your type",
+                type="message",
+                duration=2
+            )
+
+    # Refresh the ratings summary once the queued rating has been flushed:
+    # poll the flusher's version counter and bump the trigger at most once
+    # per completed flush
+    @reactive.effect
+    def _():
+        seen = awaiting_flush()
+        if seen is None:
+            return
+        if _flush_version > seen:
+            awaiting_flush.set(None)
+            with reactive.isolate():
+                ratings_trigger.set(ratings_trigger.get() + 1)
+        else:
+            reactive.invalidate_later(_FLUSH_TIMEOUT)
+
     # Handle clicks on featured animal cards
     @reactive.effect
     def _():
@@ -344,60 +758,45 @@ def server(input, output, session):
         if input.clear_search():
             ui.update_text("search_query", value="")
     
-    # Featured animals for landing page
+    # Featured animals for landing page (static content, built at startup)
     @render.ui
     def featured_animals():
-        featured_cards = []
-        
-        for idx, animal in featured_animals_df.iterrows():
-            # Handle image
-            if pd.notna(animal.get('image_url')) and animal.get('image_url') != "":
-                image_element = ui.img(
-                    src=animal['image_url'],
-                    class_="featured-image",
-                    onerror="this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMjAwIiBoZWlnaHQ9IjE0MCIgdmlld0JveD0iMCAwIDIwMCAxNDAiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxyZWN0IHdpZHRoPSIyMDAiIGhlaWdodD0iMTQwIiBmaWxsPSIjRjJGMkYyIi8+CjxjaXJjbGUgY3g9IjEwMCIgY3k9IjcwIiByPSIzMCIgZmlsbD0iIzQxOTU5OSIvPgo8L3N2Zz4='"
-                )
-            else:
-                image_element = ui.div(
-                    "🐠",
-                    class_="featured-image",
-                    style="background: linear-gradient(135deg, #447099 0%, #419599 100%); display: flex; align-items: center; justify-content: center; color: white; font-size: 24px;"
-                )
-            
-            card = ui.div(
-                image_element,
-                ui.div(animal['name'], class_="featured-name"),
-                class_="featured-card",
-                onclick=f"Shiny.setInputValue('featured_animal_click', '{animal['name']}', {{priority: 'event'}});"
-            )
-            featured_cards.append(card)
-        
-        return ui.div(*featured_cards, class_="favorites-grid")
+        return _FEATURED_UI
     
+    # Cache the last ratings summary so re-renders caused by unrelated
+    # reactive churn don't re-query DuckDB; only a ratings_trigger bump
+    # (i.e. a new rating) invalidates it
+    _summary_cache = {"version": -1, "data": None}
+
     # Ratings summary output
     @render.ui
     def ratings_summary():
         # Depend on the trigger to refresh when ratings change
-        ratings_trigger.get()
-        
-        summary_data = get_ratings_summary()
-        
+        version = ratings_trigger.get()
+
+        if version == _summary_cache["version"]:
+            summary_data = _summary_cache["data"]
+        else:
+            summary_data = get_ratings_summary()
+            _summary_cache["version"] = version
+            _summary_cache["data"] = summary_data
+
         if summary_data is None:
             return ui.div("No ratings yet", class_="no-ratings")
         
         # Create love and nope lists
         love_items = []
         if len(summary_data["love"]) > 0:
-            for i, row in summary_data["love"].iterrows():
+            for row in summary_data["love"].itertuples(index=True):
                 love_items.append(
                     ui.div(
-                        ui.tags.span(f"{i+1}.", class_="rank"),
+                        ui.tags.span(f"{row.Index + 1}.", class_="rank"),
                         ui.tags.span(
-                            row['animal_name'],
+                            row.animal_name,
                             class_="animal-name-summary",
-                            onclick=f"Shiny.setInputValue('featured_animal_click', '{row['animal_name']}', {{priority: 'event'}});"
+                            onclick=f"Shiny.setInputValue('featured_animal_click', '{row.animal_name}', {{priority: 'event'}});"
                         ),
-                        ui.tags.span(f"({row['n']} votes)", class_="vote-count"),
+                        ui.tags.span(f"({row.n} votes)", class_="vote-count"),
                         class_="rating-item"
                     )
                 )
@@ -416,16 +815,16 @@ def server(input, output, session):
         
         nope_items = []
         if len(summary_data["nope"]) > 0:
-            for i, row in summary_data["nope"].iterrows():
+            for row in summary_data["nope"].itertuples(index=True):
                 nope_items.append(
                     ui.div(
-                        ui.tags.span(f"{i+1}.", class_="rank"),
+                        ui.tags.span(f"{row.Index + 1}.", class_="rank"),
                         ui.tags.span(
-                            row['animal_name'],
+                            row.animal_name,
                             class_="animal-name-summary",
-                            onclick=f"Shiny.setInputValue('featured_animal_click', '{row['animal_name']}', {{priority: 'event'}});"
+                            onclick=f"Shiny.setInputValue('featured_animal_click', '{row.animal_name}', {{priority: 'event'}});"
                         ),
-                        ui.tags.span(f"({row['n']} votes)", class_="vote-count"),
+                        ui.tags.span(f"({row.n} votes)", class_="vote-count"),
                         class_="rating-item"
                     )
                 )
@@ -444,36 +843,34 @@ def server(input, output, session):
         
         return ui.div(love_column, nope_column, class_="ratings-summary-grid")
     
+    # Debounce the search box so a fast typist doesn't trigger a full
+    # filter + render for every intermediate keystroke
+    @debounce(0.2)
+    @reactive.calc
+    def debounced_query():
+        return input.search_query()
+
     # Reactive expression for filtered data
     @reactive.calc
     def filtered_data():
-        query = input.search_query()
-        
-        if not query or query == "":
+        query = debounced_query()
+
+        # Single characters match most of the catalog; wait for more input
+        if not query or len(query) < 2:
             return pd.DataFrame()
-        
+
         # Convert query to lowercase for case-insensitive search
         query_lower = query.lower()
-        
-        # Search across multiple columns
-        mask = (
-            aquarium_data['name'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['scientific_name'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['diet'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['habitat'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['range'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['physical_characteristics'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['fun_fact'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['conservation_status'].str.lower().str.contains(query_lower, na=False)
-        )
-        
-        return aquarium_data[mask]
+
+        return search_aquarium(query_lower)
     
     # Output result count
     @render.text
     def result_count():
         data = filtered_data()
         if len(data) == 0 and input.search_query() != "":
+            if len(input.search_query()) < 2:
+                return "Keep typing..."
             return "No results found"
         elif len(data) == 1:
             return "1 result"
@@ -488,7 +885,7 @@ def server(input, output, session):
         current_ratings = rated_animals.get()
         
         if len(data) == 0:
-            if input.search_query() != "":
+            if len(input.search_query()) >= 2:
                 return ui.div(
                     "No animals found matching your search. Try different keywords like 'shark', 'coral', 'endangered', or 'Pacific'.",
                     class_="no-results"
@@ -497,151 +894,67 @@ def server(input, output, session):
         
         # Create cards for each animal
         animal_cards = []
-        
-        for idx, animal in data.iterrows():
-            # Create unique button IDs using proper sanitization
-            animal_id = sanitize_id(animal['name'])
-            love_button_id = f"love_{animal_id}"
-            nope_button_id = f"nope_{animal_id}"
-            
-            # Create observers for the rating buttons if they don't exist
-            if love_button_id not in button_observers:
-                button_observers[love_button_id] = create_rating_observer(
-                    animal['name'], love_button_id, "Literally in love", "love"
-                )
-            
-            if nope_button_id not in button_observers:
-                button_observers[nope_button_id] = create_rating_observer(
-                    animal['name'], nope_button_id, "Not my type", "nope"
-                )
-            
-            # Determine conservation status color class
-            conservation_class = "conservation-stable"
-            if pd.notna(animal.get('conservation_status')):
-                status = str(animal['conservation_status']).lower()
-                if re.search(r'endangered|critically', status):
-                    conservation_class = "conservation-endangered"
-                elif re.search(r'vulnerable|near threatened', status):
-                    conservation_class = "conservation-vulnerable"
-            
-            # Check if this animal has been rated
-            is_rated = animal['name'] in current_ratings
-            
-            # Build card elements
-            card_elements = []
-            
+
+        display = data[_CARD_COLS].rename(columns={'_cons_class': 'cons_class'})
+        for animal in display.itertuples(index=False):
+            name = animal.name
+
             # Animal image (if available)
-            if pd.notna(animal.get('image_url')) and animal.get('image_url') != "":
-                card_elements.append(
-                    ui.img(
-                        src=animal['image_url'],
-                        class_="animal-image",
-                        onerror="this.style.display='none'"
-                    )
-                )
-            
-            # Animal name and scientific name
-            card_elements.extend([
-                ui.div(
-                    animal['name'],
-                    ui.tags.span("↗", class_="external-link-icon"),
-                    class_="animal-name",
-                    onclick=f"window.open('{animal.get('url', '#')}', '_blank')"
-                ),
-                ui.div(animal.get('scientific_name', ''), class_="scientific-name")
-            ])
-            
+            image_html = ""
+            if animal.image_url:
+                image_html = _CARD_IMAGE_TMPL.substitute(src=_esc(animal.image_url))
+
             # Animal details
             details = []
-            if pd.notna(animal.get('size')) and animal.get('size') != "":
-                details.append(
-                    ui.p(
-                        ui.tags.span("Size: ", class_="detail-label"),
-                        clean_text(animal['size'])
-                    )
-                )
-            
-            if pd.notna(animal.get('diet')) and animal.get('diet') != "":
-                details.append(
-                    ui.p(
-                        ui.tags.span("Diet: ", class_="detail-label"),
-                        clean_text(animal['diet'])
-                    )
-                )
-            
-            if pd.notna(animal.get('habitat')) and animal.get('habitat') != "":
-                details.append(
-                    ui.p(
-                        ui.tags.span("Habitat: ", class_="detail-label"),
-                        clean_text(animal['habitat'])
+            for label, value in (
+                ("Size: ", animal.size),
+                ("Diet: ", animal.diet),
+                ("Habitat: ", animal.habitat),
+                ("Range: ", animal.range),
+            ):
+                if value:
+                    details.append(
+                        _DETAIL_TMPL.substitute(label=label, value=_esc(clean_text(value)))
                     )
-                )
-            
-            if pd.notna(animal.get('range')) and animal.get('range') != "":
-                details.append(
-                    ui.p(
-                        ui.tags.span("Range: ", class_="detail-label"),
-                        clean_text(animal['range'])
-                    )
-                )
-            
-            if pd.notna(animal.get('conservation_status')) and animal.get('conservation_status') != "":
+
+            status = animal.conservation_status
+            if status:
                 details.append(
-                    ui.p(
-                        ui.tags.span("Conservation Status: ", class_="detail-label"),
-                        ui.tags.span(
-                            clean_text(animal['conservation_status']),
-                            class_=conservation_class
-                        )
+                    _CONSERVATION_TMPL.substitute(
+                        cls=animal.cons_class,
+                        value=_esc(clean_text(status))
                     )
                 )
-            
+
+            details_html = ""
             if details:
-                card_elements.append(ui.div(*details, class_="animal-details"))
-            
+                details_html = '<div class="animal-details">' + ''.join(details) + '</div>'
+
             # Fun fact
-            if pd.notna(animal.get('fun_fact')) and animal.get('fun_fact') != "":
-                card_elements.append(
-                    ui.div(
-                        ui.tags.strong("Fun Fact: "),
-                        clean_text(animal['fun_fact']),
-                        class_="fun-fact"
-                    )
-                )
-            
+            fun_fact_html = ""
+            if animal.fun_fact:
+                fun_fact_html = _FUN_FACT_TMPL.substitute(fact=_esc(clean_text(animal.fun_fact)))
+
             # Rating buttons or thank you message
-            if is_rated:
-                # Create personalized thank you message based on rating
-                rating_type = current_ratings[animal['name']]
-                if rating_type == "love":
-                    card_elements.append(
-                        ui.div("💕 Literally in love - Thanks for sharing!", class_="thank-you-message love-message")
-                    )
-                else:
-                    card_elements.append(
-                        ui.div("👎 Not my type - Thanks for sharing!", class_="thank-you-message nope-message")
-                    )
+            if name in current_ratings:
+                rating_html = _THANK_YOU_HTML[current_ratings[name]]
             else:
-                card_elements.append(
-                    ui.div(
-                        ui.input_action_button(
-                            love_button_id,
-                            "💕 Literally in love",
-                            class_="love-button"
-                        ),
-                        ui.input_action_button(
-                            nope_button_id,
-                            "👎 Not my type",
-                            class_="nope-button"
-                        ),
-                        class_="rating-buttons"
-                    )
+                rating_html = _RATING_BUTTONS_TMPL.substitute(
+                    love_js=_esc(_rating_onclick(name, "Literally in love", "love")),
+                    nope_js=_esc(_rating_onclick(name, "Not my type", "nope"))
                 )
-            
+
             # Create the complete card
-            animal_card = ui.div(*card_elements, class_="animal-card")
-            animal_cards.append(animal_card)
-        
+            animal_cards.append(ui.HTML(_CARD_TMPL.substitute(
+                image=image_html,
+                url=_esc(animal.url or '#'),
+                name=_esc(name),
+                scientific_name=_esc(animal.scientific_name),
+                details=details_html,
+                fun_fact=fun_fact_html,
+                rating=rating_html
+            )))
+
         return animal_cards
 
 # Create the app
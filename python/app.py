@@ -1,28 +1,386 @@
 from shiny import App, ui, render, reactive
+import numpy as np
 import pandas as pd
-import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 
 
+def debounce(delay_secs):
+    """Debounce a reactive calc: only emit once the source value has settled"""
+    def wrapper(f):
+        when = reactive.value(None)
+        trigger = reactive.value(0)
+
+        @reactive.calc
+        def cached():
+            return f()
+
+        @reactive.effect(priority=102)
+        def primer():
+            try:
+                cached()
+            except Exception:
+                pass
+            finally:
+                when.set(time.monotonic() + delay_secs)
+
+        @reactive.effect(priority=101)
+        def timer():
+            deadline = when()
+            if deadline is None:
+                return
+            now = time.monotonic()
+            if now >= deadline:
+                when.set(None)
+                with reactive.isolate():
+                    trigger.set(trigger() + 1)
+            else:
+                reactive.invalidate_later(deadline - now)
+
+        @reactive.calc
+        @reactive.event(trigger, ignore_none=False)
+        def debounced():
+            with reactive.isolate():
+                return cached()
+
+        return debounced
+    return wrapper
+
+
 # Read the aquarium data
 aquarium_data = pd.read_csv("aquarium.csv")
 
+# Remove quoting artifacts from the displayed fields once, with two
+# vectorized passes, so rendering no longer runs clean_text per field
+for col in ['size', 'diet', 'habitat', 'range', 'conservation_status', 'fun_fact']:
+    aquarium_data[col] = (
+        aquarium_data[col].fillna('')
+        .astype(str)
+        .str.replace(r'^"|"$', '', regex=True)
+        .str.replace('""', '"', regex=False)
+    )
+
+# The remaining text columns just need the missing-value fill, so every
+# render check can be a plain truthiness test on a string
+for col in ['name', 'scientific_name', 'image_url', 'url', 'physical_characteristics']:
+    aquarium_data[col] = aquarium_data[col].fillna('').astype(str)
+
+# Precompute a single lowercase haystack joining the searchable fields
+# (unit-separator delimited so a match can't span two fields); each query
+# is then one vectorized scan instead of eight lower+contains passes
+search_cols = [
+    'name', 'scientific_name', 'diet', 'habitat', 'range',
+    'physical_characteristics', 'fun_fact', 'conservation_status'
+]
+_search_blob = (
+    aquarium_data[search_cols].fillna('').astype(str).agg(' \x1f '.join, axis=1).str.lower()
+)
+
+# Materialize the blobs as a plain Python list: a list comprehension with
+# str.__contains__ avoids pandas' per-element UTF-8 handling. When the
+# Rust-backed ahocorasick_rs matcher is installed it takes over for
+# longer queries; it's an optional accelerator, not a requirement.
+_blobs = _search_blob.tolist()
+
+# The same blobs staged as a fixed-width bytes ndarray: np.char.find runs
+# the substring scan in one C loop over contiguous bytes. The width covers
+# the longest blob, so no overflow slow path is needed at this size.
+_blob_bytes = _search_blob.str.encode('utf-8').to_numpy()
+_blob_bytes = _blob_bytes.astype('S%d' % max((len(b) for b in _blob_bytes), default=1))
+
+# Classify conservation status once with vectorized string ops instead of
+# running two regex searches per row on every render
+_status = aquarium_data['conservation_status'].fillna('').astype(str).str.lower()
+aquarium_data['_cons_class'] = np.select(
+    [
+        _status.str.contains('endangered|critically'),
+        _status.str.contains('vulnerable|near threatened')
+    ],
+    ['conservation-endangered', 'conservation-vulnerable'],
+    default='conservation-stable'
+)
+
+# Low-cardinality columns repeat the same strings across rows; category
+# dtype stores each distinct value once. Cast after the cleanup above so
+# the cleaned values become the categories.
+for col in ['conservation_status', 'diet', 'habitat']:
+    aquarium_data[col] = aquarium_data[col].astype('category')
+
+try:
+    import ahocorasick_rs
+except ImportError:
+    ahocorasick_rs = None
+
+# Optional Numba-compiled byte scan: one contiguous uint8 buffer plus
+# offsets, searched by a parallel JIT kernel with the GIL released. Like
+# ahocorasick_rs this is a guarded accelerator, not a requirement; the
+# numpy scan below remains the default.
+try:
+    from numba import njit, prange
+
+    _scan_buf = np.frombuffer('\x00'.join(_blobs).encode('utf-8'), dtype=np.uint8)
+    _scan_offsets = np.zeros(len(_blobs) + 1, dtype=np.int64)
+    _scan_offsets[1:] = np.cumsum([len(s.encode('utf-8')) + 1 for s in _blobs])
+
+    @njit(parallel=True, cache=True)
+    def _scan_kernel(buf, offsets, rows, needle):
+        out = np.zeros(len(rows), dtype=np.bool_)
+        m = len(needle)
+        for r in prange(len(rows)):
+            i = rows[r]
+            start = offsets[i]
+            end = offsets[i + 1] - 1  # records are NUL-separated
+            for j in range(start, end - m + 1):
+                k = 0
+                while k < m and buf[j + k] == needle[k]:
+                    k += 1
+                if k == m:
+                    out[r] = True
+                    break
+        return out
+
+    # Warm the JIT so the first real search doesn't pay compile time
+    _scan_kernel(_scan_buf, _scan_offsets, np.zeros(1, dtype=np.int64),
+                 np.frombuffer(b'zz', dtype=np.uint8))
+    _HAVE_NUMBA = True
+except ImportError:
+    _HAVE_NUMBA = False
+
+# Optional DuckDB pushdown for the full-catalog scan: the engine runs the
+# LIKE as a vectorized scan with zero-copy exchange back to pandas, which
+# matters once the catalog outgrows this CSV. Guarded import again; LIKE
+# (not the fts extension) keeps substring-match semantics identical.
+try:
+    import duckdb
+
+    _search_db = duckdb.connect()
+    _search_db.register('blob_df', pd.DataFrame({
+        'rownum': np.arange(len(_blobs), dtype=np.int64),
+        'blob': _blobs
+    }))
+    _search_db.execute("CREATE TABLE aquarium_blobs AS SELECT * FROM blob_df")
+    _search_db.unregister('blob_df')
+except ImportError:
+    _search_db = None
+
+def _scan_all(query_lower):
+    """Full-catalog scan, used when the gram index can't narrow the query"""
+    if _search_db is not None:
+        # Escape LIKE wildcards so the query stays a literal substring match
+        escaped = (
+            query_lower.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        )
+        cur = _search_db.cursor()
+        rows = cur.execute(
+            "SELECT rownum FROM aquarium_blobs WHERE blob LIKE ? ESCAPE '\\' ORDER BY rownum",
+            ['%' + escaped + '%']
+        ).fetchnumpy()['rownum']
+        cur.close()
+        return rows.astype(np.int64)
+    return _scan_rows(query_lower, range(len(_blobs)))
+
+# Inverted index mapping every 2- and 3-character gram of each blob to
+# the rows containing it. A query intersects the row arrays for its grams
+# (near-constant-time dict lookups) and only the few surviving candidates
+# get the exact substring check, so the full linear scan disappears while
+# results stay identical to it.
+def _grams(text, size):
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+def _build_gram_index(blobs):
+    index = {}
+    for i, blob in enumerate(blobs):
+        for gram in _grams(blob, 2) | _grams(blob, 3):
+            index.setdefault(gram, []).append(i)
+    return {g: np.array(rows, dtype=np.int64) for g, rows in index.items()}
+
+_gram_index = _build_gram_index(_blobs)
+
+def _scan_rows(query_lower, rows):
+    """Exact substring check over the given row positions"""
+    if _HAVE_NUMBA:
+        rows = np.asarray(rows, dtype=np.int64)
+        if rows.size == 0:
+            return rows
+        needle = np.frombuffer(query_lower.encode('utf-8'), dtype=np.uint8)
+        return rows[_scan_kernel(_scan_buf, _scan_offsets, rows, needle)]
+    if ahocorasick_rs is not None and len(query_lower) >= 4:
+        ac = ahocorasick_rs.AhoCorasick([query_lower])
+        return [i for i in rows if ac.find_matches_as_indexes(_blobs[i])]
+    rows = np.asarray(rows, dtype=np.int64)
+    if rows.size == 0:
+        return rows
+    hits = np.char.find(_blob_bytes[rows], query_lower.encode('utf-8')) >= 0
+    return rows[hits]
+
+# The last query and its matches: typing a word issues a chain of
+# prefix-extending queries, and each extension can only narrow the
+# previous result, so those rows are the only ones worth rechecking
+_last = {"q": "", "rows": None}
+
+def _matching_rows(query_lower):
+    """Row positions whose search blob contains the query"""
+    n = len(query_lower)
+
+    prev_q, prev_rows = _last["q"], _last["rows"]
+    if prev_q and prev_rows is not None and query_lower.startswith(prev_q):
+        # Extending the previous query; recheck only its matches
+        rows = _scan_rows(query_lower, prev_rows)
+    elif n < 2:
+        rows = _scan_all(query_lower)
+    else:
+        # Intersect non-overlapping grams (plus the tail gram) of the query
+        size = 3 if n >= 3 else 2
+        starts = list(range(0, n - size + 1, size))
+        if starts[-1] != n - size:
+            starts.append(n - size)
+
+        candidates = None
+        for start in starts:
+            gram_rows = _gram_index.get(query_lower[start:start + size])
+            if gram_rows is None:
+                # A gram absent from every blob proves there is no match
+                candidates = []
+                break
+            if candidates is None:
+                candidates = gram_rows
+            else:
+                candidates = np.intersect1d(candidates, gram_rows, assume_unique=True)
+
+        rows = _scan_rows(query_lower, candidates) if len(candidates) else []
+
+    _last["q"], _last["rows"] = query_lower, rows
+    return rows
+
+# Query results also persist to a small on-disk SQLite key-value store,
+# so common searches (like the eight featured-card names) skip the lookup
+# even in a freshly started process. A fingerprint of the catalog wipes
+# the cache whenever the CSV changes.
+_cache_db = sqlite3.connect(
+    str(Path(__file__).parent / "search.cache"), check_same_thread=False
+)
+_cache_lock = threading.Lock()
+_cache_db.execute("CREATE TABLE IF NOT EXISTS cache (q TEXT PRIMARY KEY, rows BLOB)")
+_cache_db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+
+_fingerprint = f"{len(_blobs)}:{sum(map(len, _blobs))}"
+_stored = _cache_db.execute("SELECT value FROM meta WHERE key = 'fingerprint'").fetchone()
+if _stored is None or _stored[0] != _fingerprint:
+    _cache_db.execute("DELETE FROM cache")
+    _cache_db.execute(
+        "INSERT OR REPLACE INTO meta (key, value) VALUES ('fingerprint', ?)",
+        (_fingerprint,)
+    )
+    _cache_db.commit()
+
+@lru_cache(maxsize=256)
+def _search(query_lower):
+    """Cached row positions for a query; the catalog never changes at runtime.
+
+    Repeated searches (and the prefix chain typed on the way to them) hit
+    the in-process cache; the SQLite store answers across restarts.
+    """
+    with _cache_lock:
+        hit = _cache_db.execute(
+            "SELECT rows FROM cache WHERE q = ?", (query_lower,)
+        ).fetchone()
+    if hit is not None:
+        return np.frombuffer(hit[0], dtype=np.int32).astype(np.int64)
+
+    rows = np.array(_matching_rows(query_lower), dtype=np.int64)
+    with _cache_lock:
+        _cache_db.execute(
+            "INSERT OR REPLACE INTO cache (q, rows) VALUES (?, ?)",
+            (query_lower, rows.astype(np.int32).tobytes())
+        )
+        _cache_db.commit()
+    return rows
+
+@lru_cache(maxsize=256)
+def _search_query(query_lower):
+    """Row positions for a full query, ANDing whitespace-separated keywords.
+
+    'pacific shark' matches animals mentioning both words anywhere, not
+    just the exact phrase. Every keyword resolves through the per-token
+    cache, so reordered or extended queries reuse earlier lookups.
+    """
+    # Search the tokens, never the raw query: 'pacific ' must behave like
+    # 'pacific', not like a literal trailing-space substring
+    tokens = query_lower.split()
+    if not tokens:
+        return np.empty(0, dtype=np.int64)
+    if len(tokens) == 1:
+        return _search(tokens[0])
+    rows = _search(tokens[0])
+    for token in tokens[1:]:
+        rows = np.intersect1d(rows, _search(token), assume_unique=True)
+    return rows
+
 # Select 8 diverse and appealing animals for the landing page
 featured_animal_names = [
     "Sea Otter", "Beluga Whale", "Penguin", "Seahorse",
     "Sea Turtle", "Octopus", "Jellyfish", "Shark"
 ]
 
-featured_animals_df = aquarium_data[aquarium_data['name'].isin(featured_animal_names)]
+# Resolve the featured names through one name -> row dict instead of an
+# isin scan over the whole column, keeping the curated order above
+_by_name = {name: i for i, name in enumerate(aquarium_data['name'])}
+_featured_idxs = [_by_name[n] for n in featured_animal_names if n in _by_name]
 
 # If those specific animals aren't available, pick the first 8
-if len(featured_animals_df) < 8:
-    featured_animals_df = aquarium_data.head(8)
+featured_animals_df = aquarium_data.iloc[
+    _featured_idxs if len(_featured_idxs) == 8 else range(8)
+]
+
+def _build_featured_ui():
+    """Build the featured-animal cards once; their content never changes"""
+    featured_cards = []
+
+    # to_dict('records') yields plain dicts: no per-row Series boxing
+    for animal in featured_animals_df.to_dict('records'):
+        # Handle image
+        if pd.notna(animal.get('image_url')) and animal.get('image_url') != "":
+            image_element = ui.img(
+                src=animal['image_url'],
+                class_="featured-image",
+                onerror="this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMjAwIiBoZWlnaHQ9IjE0MCIgdmlld0JveD0iMCAwIDIwMCAxNDAiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxyZWN0IHdpZHRoPSIyMDAiIGhlaWdodD0iMTQwIiBmaWxsPSIjRjJGMkYyIi8+CjxjaXJjbGUgY3g9IjEwMCIgY3k9IjcwIiByPSIzMCIgZmlsbD0iIzQxOTU5OSIvPgo8L3N2Zz4='"
+            )
+        else:
+            image_element = ui.div(
+                "🐠",
+                class_="featured-image",
+                style="background: linear-gradient(135deg, #447099 0%, #419599 100%); display: flex; align-items: center; justify-content: center; color: white; font-size: 24px;"
+            )
+
+        card = ui.div(
+            image_element,
+            ui.div(animal['name'], class_="featured-name"),
+            class_="featured-card",
+            data_animal=animal['name']
+        )
+        featured_cards.append(card)
+
+    return ui.div(*featured_cards, class_="favorites-grid")
+
+_FEATURED_UI = _build_featured_ui()
 
 # Define UI
 app_ui = ui.page_fluid(
     ui.head_content(
-        ui.tags.link(rel="stylesheet", type="text/css", href="styles.css")
+        ui.tags.link(rel="stylesheet", type="text/css", href="styles.css"),
+        # One delegated listener instead of an inline onclick per card;
+        # cards carry data-animal / data-url attributes instead of JS
+        ui.tags.script(
+            "document.addEventListener('click', function(e) {"
+            " var a = e.target.closest('[data-animal]');"
+            " if (a) Shiny.setInputValue('featured_animal_click', a.dataset.animal, {priority: 'event'});"
+            " var u = e.target.closest('[data-url]');"
+            " if (u) window.open(u.dataset.url, '_blank');"
+            "});"
+        )
     ),
     
     ui.div(
@@ -75,16 +433,7 @@ app_ui = ui.page_fluid(
 )
 
 def server(input, output, session):
-    
-    def clean_text(text):
-        """Clean up text fields helper function"""
-        if pd.isna(text) or text == "":
-            return ""
-        # Remove extra quotes and clean up formatting
-        text = re.sub(r'^"|"$', '', str(text))
-        text = re.sub(r'""', '"', text)
-        return text
-    
+
     # Handle clicks on featured animal cards
     @reactive.effect
     def _():
@@ -98,66 +447,42 @@ def server(input, output, session):
         if input.clear_search():
             ui.update_text("search_query", value="")
     
-    # Featured animals for landing page
+    # Featured animals for landing page (static content, built at startup)
     @render.ui
     def featured_animals():
-        featured_cards = []
-        
-        for idx, animal in featured_animals_df.iterrows():
-            # Handle image
-            if pd.notna(animal.get('image_url')) and animal.get('image_url') != "":
-                image_element = ui.img(
-                    src=animal['image_url'],
-                    class_="featured-image",
-                    onerror="this.src='data:image/svg+xml;base64,PHN2ZyB3aWR0aD0iMjAwIiBoZWlnaHQ9IjE0MCIgdmlld0JveD0iMCAwIDIwMCAxNDAiIGZpbGw9Im5vbmUiIHhtbG5zPSJodHRwOi8vd3d3LnczLm9yZy8yMDAwL3N2ZyI+CjxyZWN0IHdpZHRoPSIyMDAiIGhlaWdodD0iMTQwIiBmaWxsPSIjRjJGMkYyIi8+CjxjaXJjbGUgY3g9IjEwMCIgY3k9IjcwIiByPSIzMCIgZmlsbD0iIzQxOTU5OSIvPgo8L3N2Zz4='"
-                )
-            else:
-                image_element = ui.div(
-                    "🐠",
-                    class_="featured-image",
-                    style="background: linear-gradient(135deg, #447099 0%, #419599 100%); display: flex; align-items: center; justify-content: center; color: white; font-size: 24px;"
-                )
-            
-            card = ui.div(
-                image_element,
-                ui.div(animal['name'], class_="featured-name"),
-                class_="featured-card",
-                onclick=f"Shiny.setInputValue('featured_animal_click', '{animal['name']}', {{priority: 'event'}});"
-            )
-            featured_cards.append(card)
-        
-        return ui.div(*featured_cards, class_="favorites-grid")
-    
+        return _FEATURED_UI
+
+    # Debounce the search box so a fast typist doesn't trigger a full
+    # filter + render for every intermediate keystroke
+    @debounce(0.2)
+    @reactive.calc
+    def debounced_query():
+        return input.search_query()
+
     # Reactive expression for filtered data
     @reactive.calc
     def filtered_data():
-        query = input.search_query()
-        
+        query = debounced_query()
+
         if not query or query == "":
             return pd.DataFrame()
-        
+
+        # Single characters match most of the catalog; wait for more input
+        if len(query) < 2:
+            return aquarium_data.iloc[0:0]
+
         # Convert query to lowercase for case-insensitive search
         query_lower = query.lower()
-        
-        # Search across multiple columns
-        mask = (
-            aquarium_data['name'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['scientific_name'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['diet'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['habitat'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['range'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['physical_characteristics'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['fun_fact'].str.lower().str.contains(query_lower, na=False) |
-            aquarium_data['conservation_status'].str.lower().str.contains(query_lower, na=False)
-        )
-        
-        return aquarium_data[mask]
+
+        return aquarium_data.iloc[_search_query(query_lower)]
     
     # Output result count
     @render.text
     def result_count():
         data = filtered_data()
         if len(data) == 0 and input.search_query() != "":
+            if len(input.search_query()) < 2:
+                return "Keep typing..."
             return "No results found"
         elif len(data) == 1:
             return "1 result"
@@ -171,7 +496,7 @@ def server(input, output, session):
         data = filtered_data()
         
         if len(data) == 0:
-            if input.search_query() != "":
+            if len(input.search_query()) >= 2:
                 return ui.div(
                     "No animals found matching your search. Try different keywords like 'shark', 'coral', 'endangered', or 'Pacific'.",
                     class_="no-results"
@@ -181,94 +506,98 @@ def server(input, output, session):
         # Create cards for each animal
         animal_cards = []
         
-        for idx, animal in data.iterrows():
-            # Determine conservation status color class
-            conservation_class = "conservation-stable"
-            if pd.notna(animal.get('conservation_status')):
-                status = str(animal['conservation_status']).lower()
-                if re.search(r'endangered|critically', status):
-                    conservation_class = "conservation-endangered"
-                elif re.search(r'vulnerable|near threatened', status):
-                    conservation_class = "conservation-vulnerable"
+        # to_dict('records') yields plain dicts: no per-row Series boxing
+        for animal in data.to_dict('records'):
+            # Conservation status color class is precomputed at load time
+            conservation_class = animal['_cons_class']
             
+            # Read each field once; missing values are '' after load
+            image_url = animal['image_url']
+            size = animal['size']
+            diet = animal['diet']
+            habitat = animal['habitat']
+            animal_range = animal['range']
+            conservation_status = animal['conservation_status']
+            fun_fact = animal['fun_fact']
+
             # Build card elements
             card_elements = []
-            
+
             # Animal image (if available)
-            if pd.notna(animal.get('image_url')) and animal.get('image_url') != "":
+            if image_url:
                 card_elements.append(
                     ui.img(
-                        src=animal['image_url'],
+                        src=image_url,
                         class_="animal-image",
                         onerror="this.style.display='none'"
                     )
                 )
-            
+
             # Animal name and scientific name
             card_elements.extend([
                 ui.div(
                     animal['name'],
                     ui.tags.span("↗", class_="external-link-icon"),
                     class_="animal-name",
-                    onclick=f"window.open('{animal.get('url', '#')}', '_blank')"
+                    data_url=animal['url'] or '#'
                 ),
-                ui.div(animal.get('scientific_name', ''), class_="scientific-name")
+                ui.div(animal['scientific_name'], class_="scientific-name")
             ])
-            
+
             # Animal details
             details = []
-            if pd.notna(animal.get('size')) and animal.get('size') != "":
+            if size:
                 details.append(
                     ui.p(
                         ui.tags.span("Size: ", class_="detail-label"),
-                        clean_text(animal['size'])
+                        size
                     )
                 )
-            
-            if pd.notna(animal.get('diet')) and animal.get('diet') != "":
+
+            if diet:
                 details.append(
                     ui.p(
                         ui.tags.span("Diet: ", class_="detail-label"),
-                        clean_text(animal['diet'])
+                        diet
                     )
                 )
-            
-            if pd.notna(animal.get('habitat')) and animal.get('habitat') != "":
+
+            if habitat:
                 details.append(
                     ui.p(
                         ui.tags.span("Habitat: ", class_="detail-label"),
-                        clean_text(animal['habitat'])
+                        habitat
                     )
                 )
-            
-            if pd.notna(animal.get('range')) and animal.get('range') != "":
+
+            if animal_range:
                 details.append(
                     ui.p(
                         ui.tags.span("Range: ", class_="detail-label"),
-                        clean_text(animal['range'])
+                        animal_range
                     )
                 )
-            
-            if pd.notna(animal.get('conservation_status')) and animal.get('conservation_status') != "":
+
+            if conservation_status:
                 details.append(
                     ui.p(
                         ui.tags.span("Conservation Status: ", class_="detail-label"),
                         ui.tags.span(
-                            clean_text(animal['conservation_status']),
+                            conservation_status,
                             class_=conservation_class
                         )
                     )
                 )
-            
+
             if details:
                 card_elements.append(ui.div(*details, class_="animal-details"))
-            
+
             # Fun fact
-            if pd.notna(animal.get('fun_fact')) and animal.get('fun_fact') != "":
+            if fun_fact:
                 card_elements.append(
                     ui.div(
                         ui.tags.strong("Fun Fact: "),
-                        clean_text(animal['fun_fact']),
+                        fun_fact,
                         class_="fun-fact"
                     )
                 )